@@ -30,10 +30,10 @@ class BiconnectedComponents(DFS.Searcher):
 
         # set up data structures for DFS
         self._components = []
-        self._dfsnumber = {}
-        self._activelen = {}
+        self._dfsnumber = {} # dense ids, in preorder, indexing the lists below
+        self._activelen = []
         self._active = []
-        self._low = {}
+        self._low = []
         self._ancestors = {} # directed subgraph from nodes to DFS ancestors
 
         # perform the Depth First Search
@@ -52,22 +52,28 @@ class BiconnectedComponents(DFS.Searcher):
             self._active = [child]
         else:
             self._active.append(child)
-        self._low[child] = self._dfsnumber[child] = len(self._dfsnumber)
+        self._dfsnumber[child] = len(self._low)
+        self._low.append(len(self._low))
         self._ancestors[child] = set()
-        self._activelen[child] = len(self._active)
+        self._activelen.append(len(self._active))
 
     def backedge(self,source,destination):
-        if self._dfsnumber[destination] < self._dfsnumber[source]:
-            self._low[source] = min(self._low[source],
-                                    self._dfsnumber[destination])
+        d = self._dfsnumber[destination]
+        s = self._dfsnumber[source]
+        if d < s:
+            if d < self._low[s]:
+                self._low[s] = d
             self._ancestors[source].add(destination)
 
     def postorder(self,parent,child):
-        if self._low[child] != self._dfsnumber[parent]:
-            self._low[parent] = min(self._low[parent],self._low[child])
-            self._activelen[parent] = len(self._active)
+        p = self._dfsnumber[parent]
+        lowchild = self._low[self._dfsnumber[child]]
+        if lowchild != p:
+            if lowchild < self._low[p]:
+                self._low[p] = lowchild
+            self._activelen[p] = len(self._active)
         elif parent != child:
-            self._component(self._activelen[parent],parent)
+            self._component(self._activelen[p],parent)
         elif not self._components or child not in self._components[-1]:
             self._component()
 
@@ -98,8 +104,8 @@ class BiconnectivityTester(DFS.Searcher):
         """Search for biconnected components of graph G."""
         if not isUndirected(G):
             raise NotBiconnected
-        self._dfsnumber = {}
-        self._low = {}
+        self._dfsnumber = {} # dense ids, in preorder, indexing self._low
+        self._low = []
         self._rootedge = None
         DFS.Searcher.__init__(self,G)
 
@@ -108,14 +114,21 @@ class BiconnectivityTester(DFS.Searcher):
             raise NotBiconnected    # two roots, not even connected
         elif not self._rootedge and parent != child:
             self._rootedge = (parent,child)
-        self._low[child] = self._dfsnumber[child] = len(self._dfsnumber)
+        self._dfsnumber[child] = len(self._low)
+        self._low.append(len(self._low))
 
     def backedge(self,source,destination):
-        self._low[source] = min(self._low[source],self._dfsnumber[destination])
+        d = self._dfsnumber[destination]
+        s = self._dfsnumber[source]
+        if d < self._low[s]:
+            self._low[s] = d
 
     def postorder(self,parent,child):
-        if self._low[child] != self._dfsnumber[parent]:
-            self._low[parent] = min(self._low[parent],self._low[child])
+        p = self._dfsnumber[parent]
+        lowchild = self._low[self._dfsnumber[child]]
+        if lowchild != p:
+            if lowchild < self._low[p]:
+                self._low[p] = lowchild
         elif (parent,child) == self._rootedge:
             pass                    # end of first component, >1 vertices
         elif parent != child:
@@ -144,10 +157,10 @@ class stOrienter(DFS.Searcher):
             raise ValueError("stOrienter: input not undirected graph")
 
         # set up data structures for DFS
-        self._dfsnumber = {}
-        self._low = {}
+        self._dfsnumber = {} # dense ids, in preorder, indexing the lists below
+        self._low = []
         self._down = {} # down[v] = child we're currently exploring from v
-        self._lowv = {} # lowv[n] = vertex with low number n
+        self._lowv = [] # lowv[n] = vertex with low number n
         
         # The main data structure!
         # a dictionary mapping edges to lists of edges
@@ -166,20 +179,27 @@ class stOrienter(DFS.Searcher):
         return iter(self._components)
 
     def preorder(self,parent,child):
-        self._low[child] = self._dfsnumber[child] = len(self._dfsnumber)
-        self._lowv[self._low[child]] = self._down[parent] = child
+        self._dfsnumber[child] = len(self._low)
+        self._low.append(len(self._low))
+        self._lowv.append(child)
+        self._down[parent] = child
 
     def backedge(self,source,destination):
-        if self._dfsnumber[destination] < self._dfsnumber[source]:
-            self._low[source] = min(self._low[source],
-                                    self._dfsnumber[destination])
+        d = self._dfsnumber[destination]
+        s = self._dfsnumber[source]
+        if d < s:
+            if d < self._low[s]:
+                self._low[s] = d
             if source != self._down[destination]:
                 self.addOrientation(destination,source,destination)
 
     def postorder(self,parent,child):
-        if self._low[child] != self._dfsnumber[parent]:
-            self._low[parent] = min(self._low[parent],self._low[child])
-            self.addOrientation(child,parent,self._lowv[self._low[child]])
+        p = self._dfsnumber[parent]
+        lowchild = self._low[self._dfsnumber[child]]
+        if lowchild != p:
+            if lowchild < self._low[p]:
+                self._low[p] = lowchild
+            self.addOrientation(child,parent,self._lowv[lowchild])
         elif parent != child:
             self.roots.append((parent,child))
 
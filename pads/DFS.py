@@ -14,6 +14,7 @@ reverse = -1    # returning backwards on (v,w) from w to v
 nontree = 0     # edge (v,w) is not part of the DFS tree
 
 whole_graph = object()  # special flag object, do not use as a graph vertex
+_exhausted = object()   # returned by next() when a vertex has no more children
 
 def search(G,initial_vertex = whole_graph):
     """
@@ -35,18 +36,17 @@ def search(G,initial_vertex = whole_graph):
             stack = [(v,iter(G[v]))]
             while stack:
                 parent,children = stack[-1]
-                try:
-                    child = next(children)
-                    if child in visited:
-                        yield parent,child,nontree
-                    else:
-                        yield parent,child,forward
-                        visited.add(child)
-                        stack.append((child,iter(G[child])))
-                except StopIteration:
+                child = next(children,_exhausted)
+                if child is _exhausted:
                     stack.pop()
                     if stack:
                         yield stack[-1][0],parent,reverse
+                elif child in visited:
+                    yield parent,child,nontree
+                else:
+                    yield parent,child,forward
+                    visited.add(child)
+                    stack.append((child,iter(G[child])))
             yield v,v,reverse
 
 def preorder(G,initial_vertex = whole_graph):
@@ -70,8 +70,11 @@ class Searcher:
     Handler for performing general depth first searches of graphs.
     Some or all of the routines preorder, postorder, and backedge
     should be shadowed in order to make the search do something useful.
+    Subclasses may define __slots__ for their own search state.
     """
 
+    __slots__ = ()
+
     def preorder(self,parent,child):
         """
         Called when DFS visits child, before visiting all grandchildren.
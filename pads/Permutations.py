@@ -16,7 +16,8 @@ separate object. E.g.
 
     RIGHT:
         [list(p) for p in SteinhausJohnsonTrotter(n)]
-        # makes a list of all the permutations of order n
+        list(SteinhausJohnsonTrotter(n,copy=True))
+        # either way, these make a list of all the permutations of order n
     WRONG:
         list(SteinhausJohnsonTrotter(n))
         [p for p in SteinhausJohnsonTrotter(n)]
@@ -27,61 +28,308 @@ The Steinhaus-Johnson-Trotter implementation given here sets up a
 sequence of recursive simple generators, each taking constant space,
 for a total space of O(n), where n is the number of items being permuted.
 The number of recursive calls to generate a swap that moves the item
-originally in position n of the input permutation is O(n-i+1), so all
-but a 1/n fraction of the swaps take no recursion and the rest always take O(n) time, for an average time per swap of O(1) and an average time per
-generated permutation of O(1). The other generators are similar.
+originally in position i of the input permutation is O(n-i+1), so all
+but a 1/n fraction of the swaps take no recursion and the rest always
+take O(n) time, for an average time per swap of O(1) and an average time
+per generated permutation of O(1). The other generators are similar.
 """
 
 import unittest
+from array import array
+from concurrent.futures import ProcessPoolExecutor
+from itertools import islice
+from math import factorial
+import os
 
-# 2to3 compatibility
-try:
-    xrange
-except:
-    xrange = range
+# The change sequences for small n are generated once, stored as
+# arrays of bytes, and replayed from these tables on later calls.
+# The table sizes keep each stored sequence under 40000 changes.
+_PLAIN_TABLES = [None]*9
+_DOUBLE_TABLES = [None]*7
+_STIRLING_TABLES = [None]*7
+_INVOLUTION_TABLES = [None]*12
+
+# Translation table for bytes.translate that adds one to every byte,
+# used by the array builders to relabel the items of a whole level.
+_SHIFT = bytes(range(1,256)) + b'\xff'
+
+def _TabulatedChanges(tables,generate,n):
+    """Return an iterator over the sequence generate(n), memoized in
+    tables when n is small enough to have an entry in it."""
+    if n >= len(tables):
+        return generate(n)
+    if tables[n] is None:
+        tables[n] = array('B',generate(n))
+    return iter(tables[n])
 
 def PlainChanges(n):
     """Generate the swaps for the Steinhaus-Johnson-Trotter algorithm."""
+    if n < len(_PLAIN_TABLES):
+        return _TabulatedChanges(_PLAIN_TABLES,PlainChangesArray,n)
+    return _PlainChanges(n)
+
+def PlainChangesArray(n):
+    """Return the swaps of PlainChanges(n) as a single array of unsigned
+    bytes, of length n!-1.
+    The swaps for k items come in rounds of k, one for each of the
+    permutations of k-1 items: a sweep of item k-1 down (in even rounds)
+    or up (in odd rounds), followed by the next swap for k-1 items,
+    offset by one after a downward sweep. So each position within a
+    pair of rounds is one strided slice of the array, filled either
+    with a constant or with every other swap for k-1 items."""
+    changes = array('B')
+    total = 1
+    for k in range(2,n+1):
+        older = changes
+        total *= k
+        changes = array('B',bytes(total-1))
+        step = 2*k
+        for j in range(k-1):
+            changes[j::step] = array('B',[k-2-j])*len(range(j,total-1,step))
+            changes[k+j::step] = array('B',[j])*len(range(k+j,total-1,step))
+        changes[k-1::step] = array('B',
+            older[0::2].tobytes().translate(_SHIFT))
+        changes[2*k-1::step] = older[1::2]
+    return changes
+
+def _PlainChanges(n,start=0):
+    """Generate the swaps for the Steinhaus-Johnson-Trotter algorithm,
+    skipping the first start of them. The swaps come in rounds of n,
+    each a sweep of the last item followed by one swap from the
+    recursive sequence for n-1 items, so skipping start swaps skips
+    start//n swaps of the recursion."""
     if n < 1:
         return
-    up = xrange(n-1)
-    down = xrange(n-2,-1,-1)
-    recur = PlainChanges(n-1)
+    up = range(n-1)
+    down = range(n-2,-1,-1)
+    rounds,pos = divmod(start,n)
+    recur = _PlainChanges(n-1,rounds) if rounds else PlainChanges(n-1)
     try:
-        while True:
-            for x in down:
+        if rounds & 1:
+            # resume partway through an upward sweep
+            for x in up[pos:]:
                 yield x
+            yield next(recur)
+            pos = 0
+        for x in down[pos:]:
+            yield x
+        while True:
             yield next(recur) + 1
             for x in up:
                 yield x
             yield next(recur)
+            for x in down:
+                yield x
     except StopIteration:
         pass
 
-def SteinhausJohnsonTrotter(x):
+def _PlainState(n,start):
+    """Find the state of each level of the recursion of _PlainChanges(n)
+    after the first start swaps. Returns lists phase and pos such that
+    level k has made pos[k] swaps of a downward sweep if phase[k] is 0,
+    or of an upward sweep if it is 1."""
+    phase = [0]*(n+1)
+    pos = [0]*(n+1)
+    for k in range(n,1,-1):
+        # each round of k swaps at level k pulls one swap from level k-1
+        start,pos[k] = divmod(start,k)
+        phase[k] = start & 1
+    return phase,pos
+
+def _items(x):
+    """The list of items of x, or of range(x) if x is a number."""
+    try:
+        return list(x)
+    except TypeError:
+        return list(range(x))
+
+def SteinhausJohnsonTrotter(x,copy=False,out=None):
     """Generate all permutations of x.
     If x is a number rather than an iterable, we generate the permutations
-    of range(x)."""
+    of range(x).
+    If copy is true, each permutation is generated as a separate tuple
+    rather than as the same repeatedly changed list, so that it may be
+    kept by the caller.
+    If out is given, it should be a sequence of n! rows that allow slice
+    assignment, such as a list of lists or a two-dimensional NumPy array.
+    Instead of generating the permutations, we store them into the rows
+    of out, in order, and return out."""
 
     # set up the permutation and its length
-    try:
-        perm = list(x)
-    except:
-        perm = list(range(x))
+    perm = _items(x)
     n = len(perm)
 
     # run through the sequence of swaps
+    if out is not None:
+        out[0][:] = perm
+        for k,x in enumerate(PlainChangesArray(n),1):
+            perm[x],perm[x+1] = perm[x+1],perm[x]
+            out[k][:] = perm
+        return out
+    if copy:
+        return _SteinhausJohnsonTrotterCopies(perm)
+    return _SteinhausJohnsonTrotter(perm)
+
+def _SteinhausJohnsonTrotter(perm):
+    """Generate all permutations of the list perm, changing it in place."""
     yield perm
-    for x in PlainChanges(n):
+    for x in PlainChanges(len(perm)):
         perm[x],perm[x+1] = perm[x+1],perm[x]
         yield perm
 
+def _SteinhausJohnsonTrotterCopies(perm):
+    """Generate tuples for all permutations of the list perm."""
+    yield tuple(perm)
+    for x in PlainChanges(len(perm)):
+        perm[x],perm[x+1] = perm[x+1],perm[x]
+        yield tuple(perm)
+
+def SteinhausJohnsonTrotterFold(x,init,op):
+    """Combine all permutations of x into a single value.
+    Starting from acc = init, we replace acc by op(acc,perm,swap) for
+    each permutation perm in the order of SteinhausJohnsonTrotter(x),
+    and return the final value of acc. Here swap is the position x such
+    that perm was formed from the previous permutation by swapping the
+    items at positions x and x+1, or -1 for the first permutation.
+    As with the generators, perm is a single list changed in place,
+    which op must not modify or keep, but this avoids resuming a
+    generator for each permutation when only a reduction is needed."""
+    perm = _items(x)
+    acc = op(init,perm,-1)
+    for x in PlainChanges(len(perm)):
+        perm[x],perm[x+1] = perm[x+1],perm[x]
+        acc = op(acc,perm,x)
+    return acc
+
+def SteinhausJohnsonTrotterRange(x,start,stop):
+    """Generate the permutations of x in positions start through stop-1
+    of the sequence generated by SteinhausJohnsonTrotter(x), clamped to
+    the range from 0 through n!. We jump directly to the first of these permutations, in time O(n^2),
+    by finding the position of each item within its sweep."""
+    perm = _items(x)
+    n = len(perm)
+    start = max(start,0)
+    stop = min(stop,factorial(n))
+    if start >= stop:
+        return
+
+    # item k-1 sweeps down on even-numbered sweeps of level k
+    # and up on odd-numbered sweeps
+    phase,pos = _PlainState(n,start)
+    items,perm = perm,perm[:1]
+    for k in range(2,n+1):
+        perm.insert(pos[k] if phase[k] else k-1-pos[k],items[k-1])
+
+    yield perm
+    for x in islice(_PlainChanges(n,start),stop-start-1):
+        perm[x],perm[x+1] = perm[x+1],perm[x]
+        yield perm
+
+def SteinhausJohnsonTrotterBlocks(x,blocks):
+    """Split the permutations of x into the given number of contiguous
+    blocks of positions in Steinhaus-Johnson-Trotter order.
+    Returns a list of independent generators, one per block, which
+    together generate the same permutations as SteinhausJohnsonTrotter(x)."""
+    if blocks < 1:
+        raise ValueError("SteinhausJohnsonTrotterBlocks: need at least one block")
+    n = len(_items(x))
+    total = factorial(n)
+    return [SteinhausJohnsonTrotterRange(x,total*i//blocks,
+                                         total*(i+1)//blocks)
+            for i in range(blocks)]
+
+def _SteinhausJohnsonTrotterTask(f,x,start,stop):
+    """Apply f to one block of ParallelSteinhausJohnsonTrotter."""
+    return f(SteinhausJohnsonTrotterRange(x,start,stop))
+
+def ParallelSteinhausJohnsonTrotter(f,x,blocks=None,executor=None):
+    """Apply f to blocks of the permutations of x in parallel.
+    The positions of the permutations in Steinhaus-Johnson-Trotter order
+    are split into contiguous blocks (by default, eight per processor,
+    so that uneven work is balanced across the processors), f is called
+    on a generator for each block, and the list of results is returned
+    in block order. Each block is generated from scratch within the
+    worker, so f and x must be picklable when the default executor,
+    a ProcessPoolExecutor, is used."""
+    n = len(_items(x))
+    return _ParallelBlocks("ParallelSteinhausJohnsonTrotter",
+                           _SteinhausJohnsonTrotterTask,(f,x),
+                           factorial(n),blocks,executor)
+
+def _ParallelBlocks(caller,task,args,total,blocks,executor,changes=None):
+    """Split the positions 0 through total-1 of a sequence into contiguous
+    blocks (by default, eight per processor), call task(*args,start,stop)
+    for each block in the executor, or in a new ProcessPoolExecutor if it
+    is None, and return the list of results in block order. If changes
+    is given, the changes within each block, changes[start:stop-1], are
+    passed to task as an additional final argument."""
+    if blocks is None:
+        blocks = 8*(os.cpu_count() or 1)
+    elif blocks < 1:
+        raise ValueError(caller + ": need at least one block")
+    bounds = [total*i//blocks for i in range(blocks+1)]
+    tasks = [task] + [[a]*blocks for a in args] + [bounds[:-1],bounds[1:]]
+    if changes is not None:
+        tasks.append([changes[start:max(start,stop-1)]
+                      for start,stop in zip(bounds,bounds[1:])])
+    if executor is not None:
+        return list(executor.map(*tasks))
+    with ProcessPoolExecutor() as executor:
+        return list(executor.map(*tasks))
+
+def _SweepArray(perms,width,block,down,prefix=()):
+    """Sweep a block of items back and forth through a flat array of
+    sequences of the given width, as one level of the recursion used
+    by the change generators. The result lists, for each sequence in
+    turn, the width+1 sequences formed by inserting the block into it,
+    preceded by the items in prefix; the insertion point moves downwards
+    for sequences in even positions if down is true, upwards otherwise,
+    and in the opposite direction for sequences in odd positions.
+
+    Instead of performing the swaps one at a time, we copy whole
+    columns at once with strided slice assignments: the column at
+    offset c from the insertion point always comes from the same column
+    of every other sequence of perms."""
+    rows = len(perms)//width if width else 1
+    size = len(prefix)+width+len(block)
+    result = array('B',[0])*(rows*(width+1)*size)
+    for c,x in enumerate(prefix):
+        result[c::size] = array('B',[x])*(rows*(width+1))
+    step = 2*(width+1)*size
+    for parity in (0,1):
+        source = perms[parity*width:]
+        count = (rows+1-parity)//2
+        for j in range(width+1):
+            start = (parity*(width+1)+j)*size + len(prefix)
+            position = width-j if parity != down else j
+            for c in range(width+len(block)):
+                if c < position:
+                    result[start+c::step] = source[c::2*width]
+                elif c >= position+len(block):
+                    result[start+c::step] = source[c-len(block)::2*width]
+                else:
+                    result[start+c::step] = array('B',[block[c-position]])*count
+    return result
+
+def SteinhausJohnsonTrotterArray(n):
+    """Return all permutations of range(n), in Steinhaus-Johnson-Trotter
+    order, as a single flat array of n!*n unsigned bytes. The kth
+    permutation is the slice [k*n:(k+1)*n] of the result."""
+    perms = array('B')
+    for k in range(1,n+1):
+        perms = _SweepArray(perms,k-1,[k-1],True)
+    return perms
+
 def DoublePlainChanges(n):
+    """Generate the swaps for double permutations."""
+    return _TabulatedChanges(_DOUBLE_TABLES,_DoublePlainChanges,n)
+
+def _DoublePlainChanges(n):
     """Generate the swaps for double permutations."""
     if n < 1:
         return
-    up = xrange(1,2*n-1)
-    down = xrange(2*n-2,0,-1)
+    up = range(1,2*n-1)
+    down = range(2*n-2,0,-1)
     recur = DoublePlainChanges(n-1)
     try:
         while True:
@@ -106,6 +354,19 @@ def DoubleSteinhausJohnsonTrotter(n):
         perm[x],perm[x+1] = perm[x+1],perm[x]
         yield perm
 
+def DoubleSteinhausJohnsonTrotterArray(n):
+    """Return all double permutations of the range 0 through n-1, in the
+    order generated by DoubleSteinhausJohnsonTrotter(n), as a single flat
+    array of unsigned bytes. The kth double permutation is the slice
+    [2*k*n:2*(k+1)*n] of the result.
+    Each double permutation starts with a 0, and the other 0 sweeps
+    back and forth through the double permutations of 1 through n-1."""
+    perms = array('B')
+    for k in range(1,n+1):
+        perms = array('B',perms.tobytes().translate(_SHIFT))
+        perms = _SweepArray(perms,2*k-2,[0],False,[0])
+    return perms
+
 def StirlingChanges(n):
     """Variant Steinhaus-Johnson-Trotter for Stirling permutations.
     A Stirling permutation is a double permutation in which each
@@ -115,10 +376,14 @@ def StirlingChanges(n):
     the ends of the sequence, exactly as in the standard
     Steinhaus-Johnson-Trotter algorithm. However, it differs
     in swapping items two positions apart instead of adjacent items."""
+    return _TabulatedChanges(_STIRLING_TABLES,_StirlingChanges,n)
+
+def _StirlingChanges(n):
+    """Generate the swaps for Stirling permutations."""
     if n <= 1:
         return
-    up = xrange(2*n-2)
-    down = xrange(2*n-3,-1,-1)
+    up = range(2*n-2)
+    down = range(2*n-3,-1,-1)
     recur = StirlingChanges(n-1)
     try:
         while True:
@@ -143,6 +408,132 @@ def StirlingPermutations(n):
         perm[x],perm[x+2] = perm[x+2],perm[x]
         yield perm
 
+def StirlingPermutationsArray(n):
+    """Return all Stirling permutations of order n, in the order generated
+    by StirlingPermutations(n), as a single flat array of unsigned bytes.
+    The kth Stirling permutation is the slice [2*k*n:2*(k+1)*n] of the
+    result."""
+    perms = array('B')
+    for k in range(1,n+1):
+        perms = _SweepArray(perms,2*k-2,[k-1,k-1],True)
+    return perms
+
+def _PackedWidth(n):
+    """Number of bits per item for packed double permutations of order n.
+    Four bits (one hexadecimal digit per item) suffice for n <= 16."""
+    return max(4,(n-1).bit_length())
+
+def _PackedPermutations(n,changes,gap):
+    """Generate double permutations of order n packed into integers,
+    in which item x of the double permutation is stored in bits w*x
+    through w*x+w-1, for w = _PackedWidth(n). Each change x swaps the
+    items in positions x and x+gap, by xoring the difference of the
+    two items into both of their fields."""
+    w = _PackedWidth(n)
+    mask = (1 << w) - 1
+    state = 0
+    for x in range(2*n-1,-1,-1):
+        state = (state << w) | (x >> 1)
+    yield state
+    for x in changes:
+        lo = w*x
+        hi = lo + w*gap
+        t = ((state >> lo) ^ (state >> hi)) & mask
+        state ^= (t << lo) | (t << hi)
+        yield state
+
+def PackedDoubleSteinhausJohnsonTrotter(n):
+    """Generate the double permutations of DoubleSteinhausJohnsonTrotter(n)
+    as integers, packed as by _PackedPermutations. Unlike the lists
+    generated by DoubleSteinhausJohnsonTrotter, these may be kept by
+    the caller; use UnpackDoublePermutation to recover the items."""
+    return _PackedPermutations(n,DoublePlainChanges(n),1)
+
+def PackedStirlingPermutations(n):
+    """Generate the Stirling permutations of StirlingPermutations(n)
+    as integers, packed as by _PackedPermutations."""
+    return _PackedPermutations(n,StirlingChanges(n),2)
+
+def UnpackDoublePermutation(state,n):
+    """Return the list of 2n items of a packed double permutation
+    of order n."""
+    w = _PackedWidth(n)
+    mask = (1 << w) - 1
+    return [(state >> (w*x)) & mask for x in range(2*n)]
+
+# States of a level of the recursion in InvolutionChanges.
+# A level is either pulling a single change from the level below it
+# (and passing it on, possibly offset by one) or sweeping through a
+# sequence of changes of its own.
+_PULL_UP = 0        # passing on one change for k-2 items, offset by one
+_PULL_DOWN = 1      # passing on one change for k-2 items
+_SWEEP_FIRST = 2    # moving the match for item k-1 into place
+_SWEEP_UP = 3       # sweeping the match for item k-1 upwards
+_SWEEP_DOWN = 4     # sweeping the match for item k-1 downwards
+_SWEEP_LAST = 5     # final changes before moving on to k+1 items
+
+def _InvolutionLevel(n):
+    """Initial state [n,k,state,sweep,pos] for a level of the recursion.
+    The changes for n items consist of the changes for k=min(n,3) items,
+    followed by the additional changes needed to extend the sequence
+    for k-1 items to one for k items, for each k from 4 to n."""
+    k = min(n,3)
+    return [n,k,_SWEEP_LAST,[[],[],[0],[0,1,0]][k],0]
+
+def _InvolutionStack(n):
+    """Generate change sequence for involutions on n items.
+    Rather than recursing, we keep a stack of the states of the
+    levels of the recursion; level d+1 of the stack generates the
+    sequence for k-2 items over which level d is sweeping the
+    match for item k-1."""
+    stack = [_InvolutionLevel(n)]
+    ups = [range(k-2) for k in range(n+1)]
+    downs = [range(k-3,-1,-1) for k in range(n+1)]
+    d = 0
+    while True:
+        frame = stack[d]
+        m,k,state,sweep,pos = frame
+        if pos < len(sweep):
+            if d:
+                # generate a change, and pass it back up through the
+                # levels that requested it, which then all start sweeping
+                frame[4] = pos+1
+                c = sweep[pos]
+                for j in range(d-1,-1,-1):
+                    parent = stack[j]
+                    if parent[2] == _PULL_UP:
+                        c += 1
+                        parent[2:] = _SWEEP_UP,ups[parent[1]],0
+                    else:
+                        parent[2:] = _SWEEP_DOWN,downs[parent[1]],0
+                d = 0
+                yield c
+                continue
+            # top level, finish the sweep without looking at the stack
+            for c in sweep[pos:]:
+                yield c
+        if state == _SWEEP_UP:
+            frame[2] = _PULL_DOWN
+            d += 1
+        elif state == _SWEEP_DOWN:
+            frame[2] = _PULL_UP
+            d += 1
+        elif state == _SWEEP_FIRST:
+            frame[2] = _PULL_UP
+            stack.append(_InvolutionLevel(k-2))
+            d += 1
+        elif k < m:
+            k += 1
+            frame[1:] = k,_SWEEP_FIRST,[k-2]+list(range(k-4,-1,-1)),0
+        else:
+            # this level is finished, let the level above continue
+            stack.pop()
+            if not d:
+                return
+            d -= 1
+            parent = stack[d]
+            parent[2:] = _SWEEP_LAST,[parent[1]-4],0
+
 def InvolutionChanges(n):
     """Generate change sequence for involutions on n items.
     Uses a variation of the Steinhaus-Johnson-Trotter idea,
@@ -150,28 +541,67 @@ def InvolutionChanges(n):
     in which the last item is fixed, and then we the match
     for the last item back and forth over a recursively
     generated sequence for n-2."""
-    if n <= 3:
-        for c in [[],[],[0],[0,1,0]][n]:
-            yield c
-        return
-    for c in InvolutionChanges(n-1):
+    if n < len(_INVOLUTION_TABLES):
+        return _TabulatedChanges(_INVOLUTION_TABLES,InvolutionChangesArray,n)
+    return _InvolutionChanges(n)
+
+def _InvolutionChanges(n):
+    """Generate change sequence for involutions on n items.
+    The outer level of the recursion is unrolled into a loop over
+    the number of items, and the inner levels are handled by
+    _InvolutionStack, or replayed from a table when they are small."""
+    k = min(n,3)
+    for c in [[],[],[0],[0,1,0]][k]:
         yield c
-    yield n-2
-    for i in range(n-4,-1,-1):
-        yield i
-    ic = InvolutionChanges(n-2)
-    up = range(0,n-2)
-    down = range(n-3,-1,-1)
-    try:
-        while True:
-            yield next(ic) + 1
+    for k in range(4,n+1):
+        yield k-2
+        for c in range(k-4,-1,-1):
+            yield c
+        up = range(k-2)
+        down = range(k-3,-1,-1)
+        ic = _TabulatedChanges(_INVOLUTION_TABLES,_InvolutionStack,k-2)
+        for c in ic:
+            yield c+1
             for i in up:
                 yield i
-            yield next(ic)
+            c = next(ic,None)
+            if c is None:
+                break
+            yield c
             for i in down:
                 yield i
-    except StopIteration:
-        yield n-4
+        yield k-4
+
+def InvolutionChangesArray(n):
+    """Return the change sequence of InvolutionChanges(n) as a single
+    array of unsigned bytes, of length T(n)-1 where T(n) is the number
+    of involutions on n items.
+    The sequences for k-1 and k-2 items are prefixes of the sequence for
+    k items, so we allocate the whole array once and extend it in place
+    for each k from 4 to n. The extension moves the match for item k-1
+    into place and then alternates between the changes for k-2 items,
+    read back from the start of the array, and full sweeps of that match
+    up or down; each column of these rounds is one strided slice."""
+    T = _Telephone(n)
+    changes = array('B',bytes(T[n]-1))
+    changes[:min(T[n],4)-1] = array('B',[0,1,0][:min(T[n],4)-1])
+    for k in range(4,n+1):
+        start = T[k-1]-1
+        changes[start:start+k-2] = array('B',[k-2]+list(range(k-4,-1,-1)))
+        start += k-2
+        stop = T[k]-2
+        inner = changes[:T[k-2]-1]
+        step = 2*(k-1)
+        changes[start:stop:step] = array('B',
+            inner[0::2].tobytes().translate(_SHIFT))
+        changes[start+k-1:stop:step] = inner[1::2]
+        evens = (len(inner)+1)//2
+        odds = len(inner)//2
+        for j in range(k-2):
+            changes[start+1+j:stop:step] = array('B',[j])*evens
+            changes[start+k+j:stop:step] = array('B',[k-3-j])*odds
+        changes[stop] = k-4
+    return changes
 
 def Involutions(n):
     """Generate involutions on n items.
@@ -181,21 +611,175 @@ def Involutions(n):
     Each two involutions differ by a change that either adds or
     removes an adjacent pair of swapped items, moves a swap target
     by one, or swaps two adjacent swap targets."""
-    p = list(range(n))
+    return _ChangeInvolutions(list(range(n)),InvolutionChanges(n))
+
+def _ChangeInvolutions(p,changes):
+    """Generate the involutions obtained by applying a sequence of
+    changes from InvolutionChanges to the involution p."""
     yield p
-    for c in InvolutionChanges(n):
+    for c in changes:
         x,y = p[c],p[c+1]   # current partners of c and c+1
-        if x == c and y != c+1: x = c+1
-        if x != c and y == c+1: y = c
+        if x == c:          # c fixed, pair it with c+1 unless also fixed
+            if y != c+1: x = c+1
+        elif y == c+1: y = c    # c+1 fixed, pair it with c
         p[x],p[y],p[c],p[c+1] = c+1, c, y, x    # swap partners
         yield p
 
+def _Telephone(n):
+    """List the telephone numbers (numbers of involutions) up to n."""
+    T = [1,1]
+    for k in range(2,n+1):
+        T.append(T[k-1] + (k-1)*T[k-2])
+    return T
+
+def _InvolutionAt(n,r,T):
+    """The involution in position r of the sequence generated by
+    Involutions(n), where T lists the telephone numbers up to n.
+    The involutions in which item n-1 has a partner j form a sweep of
+    j back and forth over the involutions on the remaining n-2 items,
+    as described in InvolutionsArray, so we can find the position of
+    j and recurse on the remaining items in time O(n^2)."""
+    if n < 2:
+        return list(range(n))
+    if r < T[n-1]:
+        return _InvolutionAt(n-1,r,T) + [n-1]
+    r -= T[n-1]
+    if r < n-2:
+        b,j = 0,n-3-r
+    elif r == (n-1)*T[n-2]-1:
+        b,j = 0,n-2
+    else:
+        b,j = divmod(r-(n-2),n-1)
+        b += 1
+        if not b & 1:
+            j = n-2-j
+    rest = [i for i in range(n-1) if i != j]
+    p = [0]*n
+    p[j],p[n-1] = n-1,j
+    for i,x in enumerate(_InvolutionAt(n-2,b,T)):
+        p[rest[i]] = rest[x]
+    return p
+
+def _InvolutionsTask(f,n,start,stop,changes):
+    """Apply f to one block of ParallelInvolutions."""
+    if start >= stop:
+        return f(iter(()))
+    p = _InvolutionAt(n,start,_Telephone(n))
+    return f(_ChangeInvolutions(p,changes))
+
+def ParallelInvolutions(f,n,blocks=None,executor=None):
+    """Apply f to blocks of the involutions on n items in parallel.
+    The sequence generated by Involutions(n) is split into contiguous
+    blocks (by default, eight per processor), f is called on a generator
+    for each block, and the list of results is returned in block order.
+    The changes are listed once, up front; each block then starts from
+    its first involution, found directly from its position, so the
+    blocks may be generated independently. As with
+    ParallelSteinhausJohnsonTrotter, f must be picklable when the
+    default executor, a ProcessPoolExecutor, is used."""
+    return _ParallelBlocks("ParallelInvolutions",_InvolutionsTask,(f,n),
+                           _Telephone(n)[n],blocks,executor,
+                           InvolutionChangesArray(n))
+
+def _InvolutionRow(k,j):
+    """The involution on k items that swaps j with k-1 and fixes the rest."""
+    row = array('B',range(k))
+    row[j],row[k-1] = k-1,j
+    return row
+
+def InvolutionsArray(n):
+    """Return all involutions on n items, in the order generated by
+    Involutions(n), as a single flat array of unsigned bytes. The kth
+    involution is the slice [k*n:(k+1)*n] of the result.
+
+    The sequence for k items consists of the involutions for k-1 items
+    with k-1 fixed, followed by a sweep of the partner j of item k-1
+    back and forth over the involutions for k-2 items, with the values
+    of those involutions relabeled to skip j. We build it from the
+    sequences for k-1 and k-2 items by copying whole columns at once
+    with strided slice assignments; the relabeling is done once per
+    choice of j by bytes.translate."""
+    older,perms = array('B'),array('B',range(min(n,1)))
+    for k in range(2,n+1):
+        w = k-2
+        before = len(perms)//(k-1)
+        rows = len(older)//w if w else 1
+        result = array('B',[0])*((before + (k-1)*rows)*k)
+
+        # involutions with item k-1 fixed
+        end = before*k
+        for c in range(k-1):
+            result[c:end:k] = perms[c::k-1]
+        result[k-1:end:k] = array('B',[k-1])*before
+
+        # the sweeps over the first involution for k-2 items
+        # are split between the start and end of the sequence
+        for t in range(w):
+            start = (before+t)*k
+            result[start:start+k] = _InvolutionRow(k,w-1-t)
+        result[-k:] = _InvolutionRow(k,w)
+
+        # the sweeps over the remaining involutions for k-2 items,
+        # upwards for odd-numbered rows and downwards for even ones
+        older = older.tobytes()
+        step = 2*(k-1)*k
+        for j in range(k-1):
+            table = bytes(range(j)) + bytes(range(j+1,256)) + b'\xff'
+            shifted = array('B',older.translate(table))
+            for first in (1,2):
+                count = (rows+1-first)//2
+                offset = j if first == 1 else w-j
+                start = (before + w + (first-1)*(k-1) + offset)*k
+                stop = start + count*step
+                source = first*w
+                for v in range(k-1):
+                    if v == j:
+                        result[start+v:stop:step] = array('B',[k-1])*count
+                    else:
+                        i = source + v - (v > j)
+                        result[start+v:stop:step] = shifted[i::2*w][:count]
+                result[start+k-1:stop:step] = array('B',[j])*count
+
+        older,perms = perms,result
+    return perms
+
+def _Tuples(perms):
+    """Copy a block of generated permutations, for the parallel tests."""
+    return [tuple(p) for p in perms]
+
 # If run standalone, perform unit tests
 class PermutationTest(unittest.TestCase):    
     def testChanges(self):
         """Do we get the expected sequence of changes for n=3?"""
         self.assertEqual(list(PlainChanges(3)),[1,0,1,0,1])
     
+    def testKnownChanges(self):
+        """Do all versions match the sequences of the original recursion?"""
+        known = [(4,[PlainChanges,PlainChangesArray,_PlainChanges],
+                  [2,1,0,2,0,1,2,0,2,1,0,2,0,1,2,0,2,1,0,2,0,1,2]),
+                 (3,[DoublePlainChanges,_DoublePlainChanges],
+                  [1,2,3,4,2,4,3,2,1,4,1,2,3,4]),
+                 (3,[StirlingChanges,_StirlingChanges],
+                  [3,2,1,0,3,0,1,2,3,0,3,2,1,0]),
+                 (6,[InvolutionChanges,InvolutionChangesArray,
+                     _InvolutionChanges,_InvolutionStack],
+                  [0,1,0,2,0,1,0,1,0,3,1,0,1,0,1,2,1,2,1,0,1,0,1,2,1,
+                   4,2,1,0,1,0,1,2,3,1,3,2,1,0,1,0,1,2,3,2,3,2,1,0,1,
+                   0,1,2,3,1,3,2,1,0,1,0,1,2,3,1,3,2,1,0,1,0,1,2,3,2])]
+        for n,gens,changes in known:
+            for gen in gens:
+                self.assertEqual(list(gen(n)),changes)
+
+    def testChangesArray(self):
+        """Does the array version list the same changes?"""
+        for n in range(9):
+            self.assertEqual(list(PlainChangesArray(n)),
+                             list(_PlainChanges(n)))
+        for n in (9,12):
+            self.assertEqual(next(PlainChanges(n)),next(_PlainChanges(n)))
+            self.assertEqual(list(islice(PlainChanges(n),50)),
+                             list(islice(_PlainChanges(n),50)))
+
     def testLengths(self):
         """Are the lengths of the generated sequences factorial?"""
         f = 1
@@ -225,11 +809,123 @@ class PermutationTest(unittest.TestCase):
                     self.assertEqual(p[diffs[1]],last[diffs[0]])
                 last = list(p)
     
+    def testArray(self):
+        """Does the array version list the same permutations?"""
+        for n in range(7):
+            A = SteinhausJohnsonTrotterArray(n)
+            L = [x for p in SteinhausJohnsonTrotter(n) for x in p]
+            self.assertEqual(list(A),L)
+
+    def testInvolutionsArray(self):
+        """Does the array version list the same involutions?"""
+        for n in range(9):
+            A = InvolutionsArray(n)
+            L = [x for p in Involutions(n) for x in p]
+            self.assertEqual(list(A),L)
+
+    def testBlocks(self):
+        """Do the blocks cover the permutations in order?"""
+        for i in range(7):
+            L = [list(p) for p in SteinhausJohnsonTrotter(i)]
+            for blocks in (1,5,len(L)+3):
+                B = [list(p) for b in SteinhausJohnsonTrotterBlocks(i,blocks)
+                            for p in b]
+                self.assertEqual(B,L)
+        self.assertRaises(ValueError,SteinhausJohnsonTrotterBlocks,4,0)
+
+    def testRange(self):
+        """Are ranges clamped to the positions of the permutations?"""
+        L = [tuple(p) for p in SteinhausJohnsonTrotter(4)]
+        for start,stop in ((-2,2),(-5,-1),(3,30),(7,7),(30,40)):
+            R = [tuple(p) for p in SteinhausJohnsonTrotterRange(4,start,stop)]
+            self.assertEqual(R,L[max(start,0):max(stop,0)])
+
+    def testParallel(self):
+        """Do the parallel blocks list the permutations in order?"""
+        L = ParallelSteinhausJohnsonTrotter(_Tuples,list('abcd'),blocks=5)
+        self.assertEqual([len(b) for b in L],[4,5,5,5,5])
+        self.assertEqual([p for b in L for p in b],
+                         [tuple(p) for p in SteinhausJohnsonTrotter('abcd')])
+        self.assertRaises(ValueError,ParallelSteinhausJohnsonTrotter,
+                          _Tuples,4,0)
+
+    def testInvolutionBlocks(self):
+        """Do the parallel blocks list the involutions in order?"""
+        for n in range(8):
+            L = [tuple(p) for p in Involutions(n)]
+            T = _Telephone(n)
+            self.assertEqual([tuple(_InvolutionAt(n,r,T))
+                              for r in range(len(L))],L)
+        L = ParallelInvolutions(_Tuples,7,blocks=5)
+        self.assertEqual([len(b) for b in L],[46,46,47,46,47])
+        self.assertEqual([p for b in L for p in b],
+                         [tuple(p) for p in Involutions(7)])
+        L = ParallelInvolutions(_Tuples,4,blocks=15)
+        self.assertEqual([p for b in L for p in b],
+                         [tuple(p) for p in Involutions(4)])
+        self.assertRaises(ValueError,ParallelInvolutions,_Tuples,4,0)
+
+    def testCopies(self):
+        """Do the copy and out options give the same permutations?"""
+        for i in range(7):
+            L = [tuple(p) for p in SteinhausJohnsonTrotter(i)]
+            self.assertEqual(list(SteinhausJohnsonTrotter(i,copy=True)),L)
+            out = [[None]*i for p in L]
+            self.assertIs(SteinhausJohnsonTrotter(i,out=out),out)
+            self.assertEqual([tuple(p) for p in out],L)
+
+    def testFold(self):
+        """Does folding see the same permutations and swaps?"""
+        for i in range(7):
+            L = [tuple(p) for p in SteinhausJohnsonTrotter(i)]
+            F = SteinhausJohnsonTrotterFold(i,[],
+                    lambda acc,p,x: acc + [(tuple(p),x)])
+            self.assertEqual(F,list(zip(L,[-1]+list(PlainChanges(i)))))
+        self.assertEqual(SteinhausJohnsonTrotterFold('abcd',0,
+                            lambda acc,p,x: acc + (p[0] == 'a')),6)
+
     def testListInput(self):
         """If given a list as input, is it the first output?"""
         for L in ([1,3,5,7], list('zyx'), [], [[]], list(range(20))):
             self.assertEqual(L,next(SteinhausJohnsonTrotter(L)))
 
+    def testDoublePermutations(self):
+        """Do the double and Stirling generators repeat themselves?"""
+        counts = [1,1,3,15,105,945]
+        for gen in (DoubleSteinhausJohnsonTrotter,StirlingPermutations):
+            for n in range(len(counts)):
+                perms = [tuple(p) for p in gen(n)]
+                self.assertEqual(len(perms),counts[n])
+                self.assertEqual(len(set(perms)),counts[n])
+                for p in perms:
+                    self.assertEqual(sorted(p),sorted(list(range(n))*2))
+
+    def testDoubleArrays(self):
+        """Do the array versions list the same double permutations?"""
+        for gen,arr in ((DoubleSteinhausJohnsonTrotter,
+                         DoubleSteinhausJohnsonTrotterArray),
+                        (StirlingPermutations,StirlingPermutationsArray)):
+            for n in range(6):
+                L = [x for p in gen(n) for x in p]
+                self.assertEqual(list(arr(n)),L)
+
+    def testPackedPermutations(self):
+        """Do the packed generators unpack to the same permutations?"""
+        for gen,packed in ((DoubleSteinhausJohnsonTrotter,
+                            PackedDoubleSteinhausJohnsonTrotter),
+                           (StirlingPermutations,PackedStirlingPermutations)):
+            for n in (0,1,2,3,4,5,20):
+                L = [list(p) for p in islice(gen(n),200)]
+                P = [UnpackDoublePermutation(p,n)
+                     for p in islice(packed(n),200)]
+                self.assertEqual(P,L)
+
+    def testInvolutionChangesArray(self):
+        """Does the array version list the same involution changes?"""
+        for n in range(14):
+            self.assertEqual(list(InvolutionChangesArray(n)),
+                             list(_InvolutionChanges(n)))
+
     def testInvolutions(self):
         """Are these involutions and do we have the right number of them?"""
         telephone = [1,1,2,4,10,26,76,232,764]
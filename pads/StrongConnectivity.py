@@ -5,6 +5,10 @@ DFS-based algorithm for computing strongly connected components.
 If G is a graph, then
 - StronglyConnectedComponents(G) returns a list of
   its components, each represented as a subgraph of G
+- StronglyConnectedComponents.from_csr(*graph_to_csr(G)) does the
+  same for the graph in compressed sparse row form, in which the
+  vertices are numbered from 0 and listed by consecutive slices
+  of a single list of neighbors
 - Condensation(G) returns a directed acyclic graph, the
   vertices of which are strongly connected components of G.
   Each vertex of the condensation is represented as a frozenset
@@ -14,9 +18,88 @@ D. Eppstein, July 2005.
 """
 
 import unittest
-from . import DFS
 
-class StronglyConnectedComponents(DFS.Searcher):
+def _Tarjan(indptr,indices):
+    """
+    Find the strongly connected components of a graph with vertices
+    numbered from 0 to N-1, in which the neighbors of vertex v are
+    indices[indptr[v]:indptr[v+1]].  Returns a pair (component,groups)
+    where component[v] is the number of the component containing v and
+    groups[c] is the list of vertices in component c.  Components are
+    numbered in the order in which the search completes them, so that
+    every edge leads from a component to one with an equal or smaller
+    number.
+
+    The active vertices are kept in a buffer of fixed length N with a
+    separate top pointer, so that completing a component copies its
+    vertices out of the buffer once and then just resets the pointer.
+    """
+    N = len(indptr)-1
+    dfsnumber = [-1]*N
+    low = [0]*N
+    activelen = [0]*N
+    component = [0]*N
+    groups = []
+    cursor = list(indptr)
+    active = [0]*N
+    top = 0
+    counter = 0
+    for root in range(N):
+        if dfsnumber[root] >= 0:
+            continue
+        dfsnumber[root] = low[root] = counter
+        counter += 1
+        activelen[root] = top
+        active[top] = root
+        top += 1
+        stack = [root]
+        while stack:
+            v = stack[-1]
+            i = cursor[v]
+            if i < indptr[v+1]:
+                cursor[v] = i+1
+                w = indices[i]
+                if dfsnumber[w] < 0:
+                    # tree edge, first visit to w
+                    dfsnumber[w] = low[w] = counter
+                    counter += 1
+                    activelen[w] = top
+                    active[top] = w
+                    top += 1
+                    stack.append(w)
+                elif low[w] < low[v]:
+                    low[v] = low[w]
+            else:
+                # last visit to v
+                stack.pop()
+                if low[v] == dfsnumber[v]:
+                    group = active[activelen[v]:top]
+                    for w in group:
+                        low[w] = N
+                        component[w] = len(groups)
+                    groups.append(group)
+                    top = activelen[v]
+                elif low[v] < low[stack[-1]]:
+                    low[stack[-1]] = low[v]
+    return component,groups
+
+def graph_to_csr(G):
+    """
+    Convert G to compressed sparse row form, as used by
+    StronglyConnectedComponents.from_csr.  The vertices are numbered
+    from 0 in the order in which "for v in G" lists them, and the result
+    is a pair (indptr,indices) such that the neighbors of the vertex
+    numbered v are the vertices numbered indices[indptr[v]:indptr[v+1]].
+    """
+    number = {v:i for i,v in enumerate(G)}
+    indptr = [0]
+    indices = []
+    for v in G:
+        indices.extend([number[w] for w in G[v]])
+        indptr.append(len(indices))
+    return indptr,indices
+
+class StronglyConnectedComponents:
     """
     Generate the strongly connected components of G.  G should be
     represented in such a way that "for v in G" loops through the
@@ -26,23 +109,33 @@ class StronglyConnectedComponents(DFS.Searcher):
     a sequence of subgraphs of G.
     """
 
+    __slots__ = ('_components',)
+
     def __init__(self,G):
         """Search for strongly connected components of graph G."""
-
-        # set up data structures for DFS
-        self._components = []
-        self._dfsnumber = {}
-        self._activelen = {}
-        self._active = []
-        self._low = {}
-        self._biglow = len(G)
-        self._graph = G
-
-        # perform the Depth First Search
-        DFS.Searcher.__init__(self,G)
-
-        # clean up now-useless data structures
-        del self._dfsnumber, self._activelen, self._active, self._low
+        indptr,indices = graph_to_csr(G)
+        self._search(list(G),indptr,indices)
+
+    @classmethod
+    def from_csr(cls,indptr,indices):
+        """
+        Search for strongly connected components of a graph with vertices
+        numbered from 0 to len(indptr)-2, given in compressed sparse row
+        form as by graph_to_csr.  The components are subgraphs on these
+        vertex numbers.
+        """
+        self = cls.__new__(cls)
+        self._search(range(len(indptr)-1),indptr,indices)
+        return self
+
+    def _search(self,vertices,indptr,indices):
+        """Find the components and make a subgraph for each of them."""
+        component,groups = _Tarjan(indptr,indices)
+        self._components = [{vertices[v]:{vertices[w]
+                                          for w in indices[indptr[v]:indptr[v+1]]
+                                          if component[w] == c}
+                             for v in group}
+                            for c,group in enumerate(groups)]
 
     def __iter__(self):
         """Return iterator for sequence of strongly connected components."""
@@ -52,34 +145,6 @@ class StronglyConnectedComponents(DFS.Searcher):
         """How many components are there?"""
         return len(self._components)
 
-    def _component(self,vertices):
-        """Make a new SCC."""
-        vertices = set(vertices)
-        induced = {v:{w for w in self._graph[v] if w in vertices} for v in vertices}
-        self._components.append(induced)
-
-    def preorder(self,parent,child):
-        """Handle first visit to vertex in DFS search for components."""
-        if parent == child:
-            self._active = []
-        self._activelen[child] = len(self._active)
-        self._active.append(child)
-        self._low[child] = self._dfsnumber[child] = len(self._dfsnumber)
-
-    def backedge(self,source,destination):
-        """Handle non-tree edge in DFS search for components."""
-        self._low[source] = min(self._low[source],self._low[destination])
-
-    def postorder(self,parent,child):
-        """Handle last visit to vertex in DFS search for components."""
-        if self._low[child] == self._dfsnumber[child]:
-            self._component(self._active[self._activelen[child]:])
-            for v in self._components[-1]:
-                self._low[v] = self._biglow
-            del self._active[self._activelen[child]:]
-        else:
-            self._low[parent] = min(self._low[parent],self._low[child])
-
 def Condensation(G):
     """Return a DAG with vertices equal to sets of vertices in SCCs of G."""
     components = {}
@@ -137,6 +202,16 @@ class StrongConnectivityTest(unittest.TestCase):
                     for w in graph:
                         self.assertEqual(w in graph[v] and w in C, w in C[v])
 
+    def testCSR(self):
+        """Check that CSR input gives the same components."""
+        for (graph,expectedoutput) in self.knownpairs:
+            vertices = list(graph)
+            indptr,indices = graph_to_csr(graph)
+            output = [sorted(vertices[v] for v in C) for C in
+                      StronglyConnectedComponents.from_csr(indptr,indices)]
+            output.sort()
+            self.assertEqual(output,expectedoutput)
+
     def testCondensation(self):
         """Check that the condensations are what we expect."""
         self.assertEqual(Condensation(self.G1),self.Con1)
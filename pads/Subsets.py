@@ -9,12 +9,13 @@ it should be copied to another structure.
 
 D. Eppstein, September 2017."""
 
+_exhausted = object()   # returned by next() when S has no more items
+
 def subsets(S):
     """All subsets of sequence S."""
     S = iter(S)
-    try:
-        x = next(S)
-    except StopIteration:
+    x = next(S,_exhausted)
+    if x is _exhausted:
         yield set()
         return
     for T in subsets(S):